@@ -3,18 +3,22 @@
 from __future__ import annotations
 
 import argparse
-import json
 import logging
 import os
 import re
+import sys
 import time
+from collections import deque
+from dataclasses import replace
 from datetime import datetime
 from getpass import getpass
-from typing import Iterable
+from itertools import pairwise
+from typing import TYPE_CHECKING, BinaryIO, Iterable
 
-from dotenv import load_dotenv
+import orjson
 
-from .client import FritzClient, LogEntry
+if TYPE_CHECKING:
+    from .client import FritzClient, LogEntry
 
 LOGGER = logging.getLogger("fritz_log_agent")
 
@@ -36,45 +40,90 @@ def _read_credentials(
     return username, password
 
 
-def _entries_to_lines(entries: Iterable[LogEntry], fmt: str) -> Iterable[str]:
+def _entry_to_bytes(entry: LogEntry, fmt: str) -> bytes:
     if fmt == "text":
-        for entry in entries:
-            yield entry.to_text_line()
-    else:
-        for entry in entries:
-            yield json.dumps(entry.to_json(), ensure_ascii=True)
-
-
-def _emit_output(lines: Iterable[str], output: str) -> None:
-    normalized = output.strip().lower()
-    if normalized in {"-", "stdout"}:
-        for line in lines:
-            print(line)
-        return
+        return f"{entry.to_text_line()}\n".encode("utf-8")
+    return orjson.dumps(entry.to_json(), option=orjson.OPT_APPEND_NEWLINE)
+
+
+def _is_stdout(output: str) -> bool:
+    return output.strip().lower() in {"-", "stdout"}
+
+
+def _write_entries(handle: BinaryIO, entries: Iterable[LogEntry], fmt: str) -> None:
+    handle.write(b"".join([_entry_to_bytes(entry, fmt) for entry in entries]))
+
+
+class _OutputWriter:
+    """Appends entries to stdout or to a file handle kept open between polls."""
+
+    def __init__(self, output: str, fmt: str) -> None:
+        self._path = None if _is_stdout(output) else output
+        self._fmt = fmt
+        self._handle: BinaryIO | None = None
+        self._file_id: tuple[int, int] | None = None
 
-    with open(output, "a", encoding="utf-8") as handle:
-        for line in lines:
-            handle.write(f"{line}\n")
+    def __enter__(self) -> _OutputWriter:
+        return self
 
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
-def _emit_payload(payload: dict, output: str) -> None:
-    line = json.dumps(payload, ensure_ascii=True)
-    normalized = output.strip().lower()
-    if normalized in {"-", "stdout"}:
-        print(line)
+    def write(self, entries: Iterable[LogEntry]) -> None:
+        handle = self._current_handle()
+        _write_entries(handle, entries, self._fmt)
+        handle.flush()
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+            self._file_id = None
+
+    def _current_handle(self) -> BinaryIO:
+        if self._path is None:
+            return sys.stdout.buffer
+        if self._handle is not None and not self._was_rotated():
+            return self._handle
+        self.close()
+        self._handle = open(self._path, "ab")
+        stat = os.fstat(self._handle.fileno())
+        self._file_id = (stat.st_dev, stat.st_ino)
+        return self._handle
+
+    def _was_rotated(self) -> bool:
+        # Reopen like logging.handlers.WatchedFileHandler if the file was moved away.
+        try:
+            stat = os.stat(self._path)
+        except FileNotFoundError:
+            return True
+        return (stat.st_dev, stat.st_ino) != self._file_id
+
+
+def _emit_payload(payload: dict, output: str, pretty: bool = False) -> None:
+    option = orjson.OPT_APPEND_NEWLINE
+    if pretty:
+        option |= orjson.OPT_INDENT_2
+    data = orjson.dumps(payload, option=option)
+    if _is_stdout(output):
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
         return
 
-    with open(output, "w", encoding="utf-8") as handle:
-        handle.write(f"{line}\n")
+    with open(output, "wb") as handle:
+        handle.write(data)
 
 
 _GROUPED_SUFFIX_RE = re.compile(
     r"\s*\[(\d+)\s+Meldung(?:en)?\s+seit\s+(\d{2}\.\d{2}\.\d{2})\s+(\d{2}:\d{2}:\d{2})\]\s*$"
 )
+_GROUPED_SUFFIX_SEARCH = _GROUPED_SUFFIX_RE.search
 
 
 def _parse_grouped_suffix(message: str) -> tuple[str, int | None, datetime | None]:
-    match = _GROUPED_SUFFIX_RE.search(message)
+    if "Meldung" not in message:
+        return message, None, None
+    match = _GROUPED_SUFFIX_SEARCH(message)
     if not match:
         return message, None, None
     count = int(match.group(1))
@@ -92,60 +141,108 @@ def _normalize_agent_entry(entry: LogEntry) -> LogEntry:
     message, count, since = _parse_grouped_suffix(entry.message)
     if count is None and since is None:
         return entry
-    return LogEntry(
-        timestamp=entry.timestamp,
-        group=entry.group,
-        entry_id=entry.entry_id,
-        message=message,
-        group_count=count,
-        group_since=since,
-    )
+    return replace(entry, message=message, group_count=count, group_since=since)
+
+
+class _SignatureWindow:
+    """Bounded set of entry signatures that evicts the oldest first."""
+
+    def __init__(self, maxlen: int = 4096) -> None:
+        self._maxlen = maxlen
+        self._order: deque[int] = deque()
+        self._members: set[int] = set()
+
+    def __contains__(self, signature: int) -> bool:
+        return signature in self._members
+
+    def add(self, signature: int) -> None:
+        if signature in self._members:
+            return
+        if len(self._order) >= self._maxlen:
+            self._members.discard(self._order.popleft())
+        self._order.append(signature)
+        self._members.add(signature)
+
+    def clear(self) -> None:
+        self._order.clear()
+        self._members.clear()
+
+
+def _chronological(entries: list[LogEntry]) -> list[LogEntry]:
+    # Fritz!Box lists entries newest-first; only sort if that ever breaks.
+    ordered = entries[::-1]
+    if any(newer.timestamp < older.timestamp for older, newer in pairwise(ordered)):
+        ordered.sort(key=lambda entry: entry.timestamp)
+    return ordered
 
 
 def _run_once(client: FritzClient, args: argparse.Namespace) -> int:
     entries, payload = client.fetch_log_with_retry()
     if args.print_payload:
-        _emit_payload(payload, args.output)
+        _emit_payload(payload, args.output, pretty=args.pretty)
         return 0
-    entries_sorted = sorted(entries, key=lambda entry: entry.timestamp)
-    _emit_output(_entries_to_lines(entries_sorted, args.output_format), args.output)
+    entries_sorted = _chronological(entries)
+    with _OutputWriter(args.output, args.output_format) as writer:
+        writer.write(entries_sorted)
     return 0
 
 
 def _run_agent(client: FritzClient, args: argparse.Namespace) -> int:
     last_timestamp = datetime.fromtimestamp(0)
-    last_signatures: set[str] = set()
-
-    while True:
-        try:
-            entries, _payload = client.fetch_log_with_retry()
-        except Exception as exc:
-            LOGGER.error("Fetch failed: %s", exc)
-            time.sleep(args.interval)
-            continue
-
-        entries_sorted = sorted(entries, key=lambda entry: entry.timestamp)
-        new_entries: list[LogEntry] = []
-        for entry in entries_sorted:
-            normalized_entry = _normalize_agent_entry(entry)
-            if normalized_entry.timestamp > last_timestamp:
-                last_timestamp = normalized_entry.timestamp
-                last_signatures = {_entry_signature(normalized_entry)}
-                new_entries.append(normalized_entry)
-            elif normalized_entry.timestamp == last_timestamp:
-                signature = _entry_signature(normalized_entry)
-                if signature not in last_signatures:
-                    last_signatures.add(signature)
+    last_signatures = _SignatureWindow()
+    next_tick = time.monotonic()
+
+    with _OutputWriter(args.output, args.output_format) as writer:
+        while True:
+            try:
+                entries, _payload = client.fetch_log_with_retry()
+            except Exception as exc:
+                LOGGER.error("Fetch failed: %s", exc)
+                next_tick = _sleep_until_next_tick(next_tick, args.interval)
+                continue
+
+            entries_sorted = _chronological(entries)
+            new_entries: list[LogEntry] = []
+            for entry in entries_sorted:
+                if entry.timestamp < last_timestamp:
+                    continue
+                # Raw signatures are remembered too, so entries repeated from the
+                # previous poll are skipped before the grouped-suffix parsing.
+                raw_signature = _entry_signature(entry)
+                if entry.timestamp == last_timestamp and raw_signature in last_signatures:
+                    continue
+                normalized_entry = _normalize_agent_entry(entry)
+                if normalized_entry is entry:
+                    signature = raw_signature
+                else:
+                    signature = _entry_signature(normalized_entry)
+                if entry.timestamp > last_timestamp:
+                    last_timestamp = entry.timestamp
+                    last_signatures.clear()
                     new_entries.append(normalized_entry)
+                elif signature not in last_signatures:
+                    new_entries.append(normalized_entry)
+                last_signatures.add(raw_signature)
+                last_signatures.add(signature)
+
+            if new_entries:
+                writer.write(new_entries)
 
-        if new_entries:
-            _emit_output(_entries_to_lines(new_entries, args.output_format), args.output)
+            next_tick = _sleep_until_next_tick(next_tick, args.interval)
 
-        time.sleep(args.interval)
 
+def _sleep_until_next_tick(next_tick: float, interval: float) -> float:
+    next_tick += interval
+    now = time.monotonic()
+    if next_tick < now:
+        # A poll overran the interval; restart the schedule instead of bursting.
+        next_tick = now
+    time.sleep(next_tick - now)
+    return next_tick
 
-def _entry_signature(entry: LogEntry) -> str:
-    return f"{entry.group}|{entry.entry_id}|{entry.message}"
+
+def _entry_signature(entry: LogEntry) -> int:
+    return hash((entry.group, entry.entry_id, entry.message))
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -169,6 +266,11 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Print the full JSON response once (one-shot mode only)",
     )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent the JSON printed by --print-payload",
+    )
     parser.add_argument("--agent", action="store_true", help="Run continuously")
     parser.add_argument(
         "--interval",
@@ -187,13 +289,21 @@ def main(argv: list[str] | None = None) -> int:
 
     if args.agent and args.print_payload:
         parser.error("--print-payload is only supported in one-shot mode")
+    if args.pretty and not args.print_payload:
+        parser.error("--pretty requires --print-payload")
 
     logging.basicConfig(
         level=logging.DEBUG if args.debug else logging.INFO,
         format="%(levelname)s %(message)s",
     )
 
-    load_dotenv()
+    # Deferred so --help and argument errors skip the HTTP stack and .env lookup.
+    from dotenv import load_dotenv
+
+    from .client import FritzClient
+
+    if args.username is None or args.password is None:
+        load_dotenv()
     username, password = _read_credentials(args.username, args.password)
 
     client = FritzClient(
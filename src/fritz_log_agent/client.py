@@ -3,16 +3,20 @@
 from __future__ import annotations
 
 import hashlib
+import re
 import time
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import Iterable
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LogEntry:
     timestamp: datetime
     group: str
@@ -22,9 +26,18 @@ class LogEntry:
     group_since: datetime | None = None
 
     def to_text_line(self) -> str:
-        date_str = self.timestamp.strftime("%d.%m.%y")
-        time_str = self.timestamp.strftime("%H:%M:%S")
-        return f"{date_str} {time_str} {self.group} {self.entry_id} {self.message}"
+        ts = self.timestamp
+        return "%02d.%02d.%02d %02d:%02d:%02d %s %s %s" % (
+            ts.day,
+            ts.month,
+            ts.year % 100,
+            ts.hour,
+            ts.minute,
+            ts.second,
+            self.group,
+            self.entry_id,
+            self.message,
+        )
 
     def to_json(self) -> dict:
         def _iso_with_tz(value: datetime) -> str:
@@ -54,7 +67,29 @@ def _is_zero_sid(sid: str) -> bool:
     return bool(sid) and set(sid) == {"0"}
 
 
+_SID_RE = re.compile(r"<SID>([^<]*)</SID>")
+_CHALLENGE_RE = re.compile(r"<Challenge>([^<]*)</Challenge>")
+_BLOCKTIME_RE = re.compile(r"<BlockTime>([^<]*)</BlockTime>")
+
+
+def _parse_blocktime(blocktime_text: str) -> int:
+    try:
+        return int(blocktime_text)
+    except ValueError:
+        return 0
+
+
 def _parse_login_xml(xml_text: str) -> dict:
+    sid_match = _SID_RE.search(xml_text)
+    challenge_match = _CHALLENGE_RE.search(xml_text)
+    blocktime_match = _BLOCKTIME_RE.search(xml_text)
+    if sid_match or challenge_match or blocktime_match:
+        return {
+            "sid": sid_match.group(1) if sid_match else "",
+            "challenge": challenge_match.group(1) if challenge_match else "",
+            "blocktime": _parse_blocktime(blocktime_match.group(1)) if blocktime_match else 0,
+        }
+
     try:
         root = ET.fromstring(xml_text)
     except ET.ParseError:
@@ -62,14 +97,11 @@ def _parse_login_xml(xml_text: str) -> dict:
 
     sid = root.findtext("SID", default="")
     challenge = root.findtext("Challenge", default="")
-    blocktime_text = root.findtext("BlockTime", default="0")
-    try:
-        blocktime = int(blocktime_text)
-    except ValueError:
-        blocktime = 0
+    blocktime = _parse_blocktime(root.findtext("BlockTime", default="0"))
     return {"sid": sid, "challenge": challenge, "blocktime": blocktime}
 
 
+@lru_cache(maxsize=4096)
 def _parse_timestamp(date_str: str, time_str: str) -> datetime:
     for fmt in ("%d.%m.%y %H:%M:%S", "%d.%m.%y %H:%M"):
         try:
@@ -79,6 +111,13 @@ def _parse_timestamp(date_str: str, time_str: str) -> datetime:
     raise ValueError(f"Unrecognized date/time: {date_str} {time_str}")
 
 
+def _build_session(base_url: str) -> requests.Session:
+    # Only one host is polled, so shrink requests' default pool of 10 hosts x 10 connections.
+    session = requests.Session()
+    session.mount(f"{base_url}/", HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=0))
+    return session
+
+
 class FritzClient:
     def __init__(
             self,
@@ -92,7 +131,7 @@ class FritzClient:
         self.username = username
         self.password = password
         self.timeout = timeout
-        self.session = session or requests.Session()
+        self.session = session or _build_session(self.base_url)
         self.sid: str | None = None
 
     def login(self) -> str:
@@ -113,8 +152,8 @@ class FritzClient:
 
         clean_password = _sanitize_password(self.password)
         challenge = info["challenge"]
-        raw = f"{challenge}-{clean_password}".encode("utf-16le")
-        md5_hex = hashlib.md5(raw).hexdigest()
+        raw = (challenge + "-" + clean_password).encode("utf-16-le")
+        md5_hex = hashlib.md5(raw, usedforsecurity=False).hexdigest()
         response = f"{challenge}-{md5_hex}"
 
         resp = self.session.get(
@@ -143,12 +182,12 @@ class FritzClient:
             timeout=self.timeout,
         )
         resp.raise_for_status()
-        payload = resp.json()
+        payload = orjson.loads(resp.content)
 
         if "data" not in payload or "log" not in payload.get("data", {}):
             raise RuntimeError("Unexpected response shape from Fritz!Box")
 
-        entries = list(_entries_from_payload(payload["data"]["log"]))
+        entries = _entries_from_payload(payload["data"]["log"])
         return entries, payload
 
     def fetch_log_with_retry(self) -> tuple[list[LogEntry], dict]:
@@ -160,14 +199,14 @@ class FritzClient:
             return self.fetch_log()
 
 
-def _entries_from_payload(items: Iterable[dict]) -> Iterable[LogEntry]:
-    for item in items:
-        date_str = str(item.get("date", ""))
-        time_str = str(item.get("time", ""))
-        if not date_str or not time_str:
-            continue
-        timestamp = _parse_timestamp(date_str, time_str)
-        group = str(item.get("group", ""))
-        entry_id = str(item.get("id", ""))
-        message = str(item.get("msg", ""))
-        yield LogEntry(timestamp=timestamp, group=group, entry_id=entry_id, message=message)
+def _entries_from_payload(items: Iterable[dict]) -> list[LogEntry]:
+    return [
+        LogEntry(
+            timestamp=_parse_timestamp(date_str, time_str),
+            group=str(item.get("group", "")),
+            entry_id=str(item.get("id", "")),
+            message=str(item.get("msg", "")),
+        )
+        for item in items
+        if (date_str := str(item.get("date", ""))) and (time_str := str(item.get("time", "")))
+    ]